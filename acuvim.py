@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import array
+import logging
 import math
+import socket
+import struct
 import time
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List
+from typing import Iterator, List
 
+import numpy as np
 from pymodbus.client import ModbusTcpClient
 
 # -----------------------------
@@ -25,6 +30,14 @@ MAX_RECORDS_PER_WINDOW = WINDOW_MAX_WORDS // RECORD_SIZE_WORDS  # = 8
 
 RECORD_INTERVAL_MINUTES = 1
 
+_logger = logging.getLogger(__name__)
+
+# Precompiled record codecs: 14 big-endian words on the wire; the decoded
+# view treats the four accumulator hi/lo pairs as signed 32-bit ints so
+# struct does the sign extension natively.
+_RECORD_PACK = struct.Struct(">14H")
+_RECORD_UNPACK = struct.Struct(">HHHHHiiiiH")
+
 # Energy scaling:
 # Raw accumulators are in "0.1 kWh / 0.1 kVARh" units (100x bigger than before).
 ENERGY_SCALE_KWH = 0.1     # 1 LSB = 0.1 kWh / 0.1 kVARh
@@ -90,6 +103,149 @@ class AcuvimRecord:
     crc: int                  # raw CRC / trailing word
 
 
+@dataclass
+class AcuvimRecordBatch:
+    """
+    Struct-of-arrays batch of historical log records: one NumPy column per
+    field instead of a Python object per record. Much smaller in memory
+    (~52 payload bytes/record vs ~200+ for a dataclass instance) and lets
+    downstream consumers run vectorized scans over whole columns.
+    """
+    index: np.ndarray          # int64
+    seq: np.ndarray            # int64
+    timestamp: np.ndarray      # datetime64[s]
+    kwh_import: np.ndarray     # float64
+    kwh_export: np.ndarray     # float64
+    kvarh_import: np.ndarray   # float64
+    kvarh_export: np.ndarray   # float64
+    crc: np.ndarray            # uint16
+
+    def __len__(self) -> int:
+        return self.index.shape[0]
+
+    @classmethod
+    def from_words(cls, raw_words: List[int]) -> "AcuvimRecordBatch":
+        """
+        Vectorized parse of a run of 14-word records (see AcuvimRecord for
+        the layout): reshape to (N, 14), combine hi/lo word pairs and
+        sign-extend the four accumulators column-wise.
+        """
+        arr = np.asarray(raw_words, dtype=np.uint32).reshape(-1, RECORD_SIZE_WORDS)
+
+        idx = ((arr[:, 0] << 16) | arr[:, 1]).astype(np.int64)
+        seq = arr[:, 1].astype(np.int64)
+
+        # 4 x 32-bit signed accumulators: columns (5,6) (7,8) (9,10) (11,12)
+        hi = arr[:, 5:13:2]
+        lo = arr[:, 6:13:2]
+        energies = (
+            ((hi << 16) | lo).view(np.int32).astype(np.float64) * ENERGY_SCALE_KWH
+        )
+
+        # Timestamp bytes (plain hex-decimal, NOT BCD)
+        yy = arr[:, 2] >> 8
+        mm = arr[:, 2] & 0xFF
+        dd = arr[:, 3] >> 8
+        hh = arr[:, 3] & 0xFF
+        minute = arr[:, 4] >> 8
+        sec = arr[:, 4] & 0xFF
+
+        timestamps = cls._decode_timestamps(yy, mm, dd, hh, minute, sec)
+
+        return cls(
+            index=idx,
+            seq=seq,
+            timestamp=timestamps,
+            kwh_import=energies[:, 0].copy(),
+            kwh_export=energies[:, 1].copy(),
+            kvarh_import=energies[:, 2].copy(),
+            kvarh_export=energies[:, 3].copy(),
+            crc=arr[:, 13].astype(np.uint16),
+        )
+
+    @staticmethod
+    def _decode_timestamps(yy, mm, dd, hh, minute, sec) -> np.ndarray:
+        """
+        Build the datetime64[s] timestamp column.
+
+        Records are spaced exactly RECORD_INTERVAL_MINUTES apart, so only
+        the first timestamp needs full datetime construction; the rest are
+        derived with an arange and verified (vectorized) against the
+        decoded fields. Only on a discontinuity (e.g. a logging gap) do we
+        fall back to constructing every datetime.
+        """
+        n = yy.shape[0]
+        if n == 0:
+            return np.empty(0, dtype="datetime64[s]")
+
+        base = datetime(
+            2000 + int(yy[0]), int(mm[0]), int(dd[0]),
+            int(hh[0]), int(minute[0]), int(sec[0]),
+        )
+        expected = np.datetime64(base, "s") + np.arange(n) * np.timedelta64(
+            RECORD_INTERVAL_MINUTES * 60, "s"
+        )
+
+        # Decompose the expected timestamps back into calendar fields and
+        # compare with the decoded words, all column-wise.
+        as_years = expected.astype("datetime64[Y]")
+        as_months = expected.astype("datetime64[M]")
+        as_days = expected.astype("datetime64[D]")
+        secs_of_day = (expected - as_days).astype(np.int64)
+
+        matches = (
+            (as_years.astype(np.int64) + 1970 == 2000 + yy)
+            & ((as_months - as_years).astype(np.int64) + 1 == mm)
+            & ((as_days - as_months).astype(np.int64) + 1 == dd)
+            & (secs_of_day // 3600 == hh)
+            & (secs_of_day % 3600 // 60 == minute)
+            & (secs_of_day % 60 == sec)
+        )
+        if matches.all():
+            return expected
+
+        return np.array(
+            [
+                datetime(
+                    2000 + int(yy[i]), int(mm[i]), int(dd[i]),
+                    int(hh[i]), int(minute[i]), int(sec[i]),
+                )
+                for i in range(n)
+            ],
+            dtype="datetime64[s]",
+        )
+
+    @classmethod
+    def concatenate(cls, batches: List["AcuvimRecordBatch"]) -> "AcuvimRecordBatch":
+        return cls(
+            index=np.concatenate([b.index for b in batches]),
+            seq=np.concatenate([b.seq for b in batches]),
+            timestamp=np.concatenate([b.timestamp for b in batches]),
+            kwh_import=np.concatenate([b.kwh_import for b in batches]),
+            kwh_export=np.concatenate([b.kwh_export for b in batches]),
+            kvarh_import=np.concatenate([b.kvarh_import for b in batches]),
+            kvarh_export=np.concatenate([b.kvarh_export for b in batches]),
+            crc=np.concatenate([b.crc for b in batches]),
+        )
+
+    def to_records(self) -> List[AcuvimRecord]:
+        """Materialize List[AcuvimRecord] for legacy call sites."""
+        ts = self.timestamp.tolist()  # datetime64[s] -> datetime objects
+        return [
+            AcuvimRecord(
+                index=int(self.index[i]),
+                seq=int(self.seq[i]),
+                timestamp=ts[i],
+                kwh_import=float(self.kwh_import[i]),
+                kwh_export=float(self.kwh_export[i]),
+                kvarh_import=float(self.kvarh_import[i]),
+                kvarh_export=float(self.kvarh_export[i]),
+                crc=int(self.crc[i]),
+            )
+            for i in range(len(self))
+        ]
+
+
 class AcuvimClient:
     """
     High-level helper for Acuvim CL historical log retrieval
@@ -108,14 +264,52 @@ class AcuvimClient:
         if hasattr(self._client, "device_id"):
             self._client.device_id = self.unit
 
+        # Status word echoed by the FC23 window write, if any (see
+        # _program_window / _wait_ready).
+        self._pre_polled_status: int | None = None
+
     # ------------- lifecycle -------------
 
     def connect(self) -> bool:
-        return self._client.connect()
+        ok = self._client.connect()
+        if ok:
+            self._disable_nagle()
+        return ok
+
+    def _disable_nagle(self) -> None:
+        """
+        Set TCP_NODELAY on the underlying socket. Modbus ADUs are tiny
+        (~12 bytes) and the program->poll->read handshake is latency-bound,
+        so Nagle's algorithm can add ~40ms of ACK coalescing per request.
+        """
+        try:
+            sock = self._client.socket
+            if sock is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except (AttributeError, OSError):
+            # Tolerate pymodbus transport differences; Nagle is an
+            # optimization, not a requirement.
+            pass
 
     def close(self) -> None:
         self._client.close()
 
+    def is_connected(self) -> bool:
+        """True while the underlying TCP session is up."""
+        return bool(getattr(self._client, "connected", False))
+
+    def reconnect(self) -> bool:
+        """
+        Tear down and re-establish the TCP session.
+
+        Long-running collectors should construct one AcuvimClient per meter
+        and keep it across collection cycles (each reconnect costs a TCP
+        handshake plus slow-start on WAN links); on a failed Modbus call,
+        call reconnect() and retry rather than building a new client.
+        """
+        self._client.close()
+        return self.connect()
+
     def __enter__(self) -> "AcuvimClient":
         if not self.connect():
             raise RuntimeError(f"Could not connect to {self.host}:{self.port}")
@@ -128,8 +322,10 @@ class AcuvimClient:
 
     @staticmethod
     def _log(msg: str) -> None:
-        ts = datetime.now().isoformat(timespec="seconds")
-        print(f"[{ts}] {msg}")
+        # Leveled logging: a no-op unless the caller enables DEBUG, so
+        # per-operation message formatting stays off the hot path by
+        # default. Timestamps come from the logging formatter.
+        _logger.debug(msg)
 
     # ------------- time operations -------------
 
@@ -152,19 +348,47 @@ class AcuvimClient:
             ) from e
 
     def write_meter_time(self, new_time: datetime) -> None:
-        """Write a datetime into registers 0x1040..0x1045."""
-        regs = [
+        """
+        Write a datetime into registers 0x1040..0x1045.
+
+        Uses FC23 (Read/Write Multiple Registers) so the write and the
+        verification read happen in one round-trip: the spec performs the
+        write before the read, so the echoed registers confirm the new
+        time atomically.
+        """
+        regs = (
             new_time.year,
             new_time.month,
             new_time.day,
             new_time.hour,
             new_time.minute,
             new_time.second,
-        ]
+        )
 
-        rq = self._client.write_registers(address=TIME_REG_BASE, values=regs)
+        rq = self._client.readwrite_registers(
+            read_address=TIME_REG_BASE,
+            read_count=6,
+            write_address=TIME_REG_BASE,
+            values=list(regs),
+        )
         if rq.isError():
-            raise RuntimeError(f"Time write error at 0x{TIME_REG_BASE:04X}: {rq}")
+            # Some firmware revisions reject FC23 (IllegalFunction); fall
+            # back to FC16 write + FC03 verification read (2 RTTs).
+            self._log(f"FC23 time write rejected ({rq}) – falling back to FC16+FC03")
+            wq = self._client.write_registers(address=TIME_REG_BASE, values=list(regs))
+            if wq.isError():
+                raise RuntimeError(f"Time write error at 0x{TIME_REG_BASE:04X}: {wq}")
+            rq = self._client.read_holding_registers(address=TIME_REG_BASE, count=6)
+            if rq.isError():
+                raise RuntimeError(f"Time read-back error at 0x{TIME_REG_BASE:04X}: {rq}")
+
+        echoed = tuple(rq.registers)
+        if echoed != regs:
+            # The meter may round (e.g. drop seconds); surface it rather
+            # than failing, since the write itself was acknowledged.
+            self._log(
+                f"Time write echo mismatch: wrote {regs}, meter reports {echoed}"
+            )
 
     # ------------- core Modbus operations -------------
 
@@ -217,18 +441,51 @@ class AcuvimClient:
 
         values = [log_type, val_6001, offset_hi, offset_lo]
 
-        rq = self._client.write_registers(address=REG_LOG_TYPE, values=values)
+        # FC23 (Read/Write Multiple Registers): program 6000..6003 and read
+        # back 6001 in one request/response pair. That saves one round-trip
+        # versus a separate FC16 write, and on fast meters the echoed status
+        # is already READY so _wait_ready can return without polling.
+        self._pre_polled_status = None
+        rq = self._client.readwrite_registers(
+            read_address=REG_REC_NUM_STATUS,
+            read_count=1,
+            write_address=REG_LOG_TYPE,
+            values=values,
+        )
         self._log(
             f"Wrote 6000..6003 = {[f'0x{v:04X}' for v in values]} -> {rq}"
         )
         if rq.isError():
-            raise RuntimeError(f"Window write error at 0x{REG_LOG_TYPE:04X}: {rq}")
+            # Firmware that rejects FC23 (IllegalFunction) still accepts
+            # a plain FC16 write; without the echoed 6001 word _wait_ready
+            # simply polls as before.
+            self._log(f"FC23 window write rejected ({rq}) – falling back to FC16")
+            wq = self._client.write_registers(address=REG_LOG_TYPE, values=values)
+            if wq.isError():
+                raise RuntimeError(f"Window write error at 0x{REG_LOG_TYPE:04X}: {wq}")
+            return
+
+        if rq.registers:
+            self._pre_polled_status = rq.registers[0]
 
     def _wait_ready(self, timeout_sec: float = 5.0) -> None:
         """
         Poll 6001 until low byte == 0x0B (READY), or timeout.
+
+        Uses exponential backoff (2ms doubling up to 50ms) instead of a
+        fixed 200ms sleep: healthy meters are usually READY within a few
+        milliseconds of the window write, so the first or second poll hits.
         """
+        # The FC23 window write already echoed 6001; if that showed READY
+        # we can skip polling entirely.
+        pre = self._pre_polled_status
+        self._pre_polled_status = None
+        if pre is not None and (pre & 0x00FF) == 0x0B:
+            self._log(f"Window READY from write echo (6001=0x{pre:04X}).")
+            return
+
         deadline = time.time() + timeout_sec
+        delay = 0.002
 
         while True:
             rr = self._client.read_holding_registers(address=REG_REC_NUM_STATUS, count=1)
@@ -250,12 +507,15 @@ class AcuvimClient:
                     f"Timeout waiting for ready; 6001=0x{val:04X} (status=0x{status:02X})"
                 )
 
-            time.sleep(0.2)
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
 
-    def _read_window_data(self, records_per_window: int) -> List[int]:
+    def _read_window_data(self, records_per_window: int) -> "array.array":
         """
         Read raw data from 6004.. for the given number of records.
-        Returns a flat list of 16-bit words.
+        Returns a flat array.array('H') of 16-bit words: ~2 bytes per word
+        instead of ~28 for a list of PyLongs, and NumPy can view it
+        without per-element conversion.
         """
         total_record_words = records_per_window * RECORD_SIZE_WORDS
         count = min(WINDOW_MAX_WORDS, total_record_words)
@@ -265,11 +525,14 @@ class AcuvimClient:
             raise RuntimeError(f"Error reading window from 0x{REG_WINDOW:04X}: {rr}")
 
         regs = rr.registers
-        self._log(
-            f"Read {len(regs)} words starting at 0x{REG_WINDOW:04X}: "
-            + " ".join(f"{w:04X}" for w in regs)
-        )
-        return regs
+        # The hex dump formats 100+ words per window; only build it when
+        # DEBUG output is actually enabled.
+        if _logger.isEnabledFor(logging.DEBUG):
+            self._log(
+                f"Read {len(regs)} words starting at 0x{REG_WINDOW:04X}: "
+                + " ".join(f"{w:04X}" for w in regs)
+            )
+        return array.array("H", regs)
 
     # ------------- record parsing -------------
 
@@ -300,18 +563,19 @@ class AcuvimClient:
         if len(words) != RECORD_SIZE_WORDS:
             raise ValueError(f"Expected {RECORD_SIZE_WORDS} words, got {len(words)}")
 
-        idx_hi = words[0]
-        idx_lo = words[1]
+        # Round-trip through struct: one pack + one unpack decodes the
+        # record header and sign-extends all four accumulators in C,
+        # replacing per-field slicing and _decode_s32 calls.
+        (
+            idx_hi, idx_lo, w2, w3, w4,
+            kwh_imp_raw, kwh_exp_raw, kvarh_imp_raw, kvarh_exp_raw,
+            crc,
+        ) = _RECORD_UNPACK.unpack(_RECORD_PACK.pack(*words))
+
         idx_combined = (idx_hi << 16) | idx_lo
         seq = idx_lo  # convenient low 16 bits
 
-        ts = AcuvimClient._parse_timestamp(words[2], words[3], words[4])
-
-        # 4 x 32-bit signed accumulators (kWh/kVARh)
-        kwh_imp_raw = _decode_s32(words[5], words[6])
-        kwh_exp_raw = _decode_s32(words[7], words[8])
-        kvarh_imp_raw = _decode_s32(words[9], words[10])
-        kvarh_exp_raw = _decode_s32(words[11], words[12])
+        ts = AcuvimClient._parse_timestamp(w2, w3, w4)
 
         # Apply scaling (see ENERGY_SCALE_KWH)
         kwh_imp = kwh_imp_raw * ENERGY_SCALE_KWH
@@ -319,8 +583,6 @@ class AcuvimClient:
         kvarh_imp = kvarh_imp_raw * ENERGY_SCALE_KWH
         kvarh_exp = kvarh_exp_raw * ENERGY_SCALE_KWH
 
-        crc = words[13]
-
         return AcuvimRecord(
             index=idx_combined,
             seq=seq,
@@ -332,6 +594,11 @@ class AcuvimClient:
             crc=crc,
         )
 
+    @staticmethod
+    def _parse_window(raw_words: List[int]) -> List[AcuvimRecord]:
+        """Vectorized parse of a whole window; see AcuvimRecordBatch."""
+        return AcuvimRecordBatch.from_words(raw_words).to_records()
+
     # ------------- high-level retrieval -------------
 
     def latch_log(self) -> None:
@@ -341,44 +608,42 @@ class AcuvimClient:
         """
         self._log("latch_log(): no-op for CL window mode.")
 
-    def read_records_range(
+    def iter_records_batches(
         self,
         offset: int,
         count: int,
         records_per_window: int = MAX_RECORDS_PER_WINDOW,
-    ) -> List[AcuvimRecord]:
+    ) -> Iterator[AcuvimRecordBatch]:
         """
-        Read 'count' historical records starting at 'offset' (0 = oldest)
-        using the window mechanism, chunked into windows of up to
-        records_per_window (max 8).
-
-        Returns records in chronological order.
+        Yield 'count' historical records starting at 'offset' (0 = oldest)
+        as one columnar AcuvimRecordBatch per window (up to
+        records_per_window records each, max 8), in chronological order.
+
+        Streaming keeps peak memory at O(window) rather than O(count), so
+        a full log dump stays flat on memory-constrained hosts while the
+        consumer persists each batch as it arrives.
+
+        The windows are pipelined: as soon as window k's raw words are on
+        the wire, window k+1 is programmed so the meter fills it while we
+        parse window k's records. That hides one program+fill round-trip
+        per window behind pure-CPU parsing.
         """
         if count <= 0:
-            return []
+            return
 
         if records_per_window <= 0 or records_per_window > MAX_RECORDS_PER_WINDOW:
             records_per_window = MAX_RECORDS_PER_WINDOW
 
-        records: List[AcuvimRecord] = []
-
         remaining = count
         current_offset = offset
+        chunk = min(records_per_window, remaining)
 
-        while remaining > 0:
-            chunk = min(records_per_window, remaining)
+        self._log(f"Reading window: offset={current_offset}, records={chunk}")
+        self._program_window(offset=current_offset, records_per_window=chunk)
 
-            self._log(
-                f"Reading window: offset={current_offset}, records={chunk}"
-            )
-
-            # 1) program window for this chunk
-            self._program_window(offset=current_offset, records_per_window=chunk)
-
-            # 2) wait for READY
+        while True:
+            # 1) wait for the programmed window, then pull its raw words
             self._wait_ready()
-
-            # 3) read raw window data and parse records
             raw_words = self._read_window_data(records_per_window=chunk)
 
             if len(raw_words) < chunk * RECORD_SIZE_WORDS:
@@ -387,14 +652,71 @@ class AcuvimClient:
                     f"expected at least {chunk * RECORD_SIZE_WORDS}"
                 )
 
-            for i in range(chunk):
-                start = i * RECORD_SIZE_WORDS
-                end = start + RECORD_SIZE_WORDS
-                rec_words = raw_words[start:end]
-                rec = self._parse_record(rec_words)
-                records.append(rec)
+            # 2) program the NEXT window before parsing this one, so the
+            #    meter-side window fill overlaps our parse work
+            next_offset = current_offset + chunk
+            next_remaining = remaining - chunk
+            next_chunk = min(records_per_window, next_remaining)
+            if next_remaining > 0:
+                self._log(
+                    f"Reading window: offset={next_offset}, records={next_chunk}"
+                )
+                self._program_window(
+                    offset=next_offset, records_per_window=next_chunk
+                )
+
+            # 3) parse the current window (pure CPU, vectorized)
+            yield AcuvimRecordBatch.from_words(
+                raw_words[: chunk * RECORD_SIZE_WORDS]
+            )
 
-            current_offset += chunk
-            remaining -= chunk
+            if next_remaining <= 0:
+                break
 
-        return records
\ No newline at end of file
+            current_offset = next_offset
+            remaining = next_remaining
+            chunk = next_chunk
+
+    def iter_records_range(
+        self,
+        offset: int,
+        count: int,
+        records_per_window: int = MAX_RECORDS_PER_WINDOW,
+    ) -> Iterator[AcuvimRecord]:
+        """Stream individual AcuvimRecord objects, one window at a time."""
+        for batch in self.iter_records_batches(
+            offset=offset, count=count, records_per_window=records_per_window
+        ):
+            yield from batch.to_records()
+
+    def read_records_batch(
+        self,
+        offset: int,
+        count: int,
+        records_per_window: int = MAX_RECORDS_PER_WINDOW,
+    ) -> AcuvimRecordBatch:
+        """Materialize iter_records_batches as one concatenated batch."""
+        batches = list(
+            self.iter_records_batches(
+                offset=offset, count=count, records_per_window=records_per_window
+            )
+        )
+        if not batches:
+            return AcuvimRecordBatch.from_words([])
+        return AcuvimRecordBatch.concatenate(batches)
+
+    def read_records_range(
+        self,
+        offset: int,
+        count: int,
+        records_per_window: int = MAX_RECORDS_PER_WINDOW,
+    ) -> List[AcuvimRecord]:
+        """
+        Compatibility wrapper that materializes the streamed records as
+        List[AcuvimRecord] for existing call sites.
+        """
+        return list(
+            self.iter_records_range(
+                offset=offset, count=count, records_per_window=records_per_window
+            )
+        )
\ No newline at end of file
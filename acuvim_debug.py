@@ -6,11 +6,14 @@
 from __future__ import annotations
 
 import argparse
+import logging
+import socket
 import time
-from datetime import datetime
 
 from pymodbus.client import ModbusTcpClient
 
+_logger = logging.getLogger(__name__)
+
 LOG_STATUS_BASE = 0x6100  # status block
 REG_LOG_TYPE = 0x6000     # 6000
 REG_REC_NUM_STATUS = 0x6001
@@ -23,7 +26,7 @@ WINDOW_MAX_WORDS = 123    # from manual
 
 
 def log(msg: str) -> None:
-    print(f"[{datetime.now().isoformat(timespec='seconds')}] {msg}")
+    _logger.debug(msg)
 
 
 def read_status(client: ModbusTcpClient) -> None:
@@ -39,7 +42,7 @@ def read_status(client: ModbusTcpClient) -> None:
     log(f"Log status: max={max_records}, used={used_records}, recordSize={record_size}B")
 
 
-def program_window(client: ModbusTcpClient, offset: int, records_per_window: int) -> None:
+def program_window(client: ModbusTcpClient, offset: int, records_per_window: int) -> int | None:
     """
     Program the log window exactly like AcuView2 style:
 
@@ -47,6 +50,11 @@ def program_window(client: ModbusTcpClient, offset: int, records_per_window: int
       6001: hi = records_per_window, lo = status (0)
       6002: offset_hi
       6003: offset_lo
+
+    Returns the value of 6001 read immediately after the write, or None.
+    On CL-family meters the FC16 response is typically acknowledged only
+    once the window fill has completed, so this first read is very often
+    already READY and wait_ready can be skipped.
     """
     if records_per_window <= 0:
         records_per_window = 1
@@ -66,12 +74,31 @@ def program_window(client: ModbusTcpClient, offset: int, records_per_window: int
     if rq.isError():
         raise RuntimeError(f"Window write error at 0x{REG_LOG_TYPE:04X}: {rq}")
 
+    # Inline first poll: check 6001 right away instead of always entering
+    # the wait_ready sleep loop.
+    rr = client.read_holding_registers(address=REG_REC_NUM_STATUS, count=1)
+    if rr.isError():
+        return None
+    return rr.registers[0]
 
-def wait_ready(client: ModbusTcpClient, timeout_sec: float = 5.0) -> None:
+
+def wait_ready(
+    client: ModbusTcpClient,
+    timeout_sec: float = 5.0,
+    pre_polled: int | None = None,
+) -> None:
     """
     Poll 6001 until low byte == 0x0B (READY), or timeout.
+    Backs off exponentially (2ms .. 50ms) so fast meters are caught early.
+    Pass program_window's return value as pre_polled to skip the loop
+    when the window was already READY after the write.
     """
+    if pre_polled is not None and (pre_polled & 0x00FF) == 0x0B:
+        log(f"Window READY from post-write check (6001=0x{pre_polled:04X}).")
+        return
+
     deadline = time.time() + timeout_sec
+    delay = 0.002
 
     while True:
         rr = client.read_holding_registers(address=REG_REC_NUM_STATUS, count=1)
@@ -92,7 +119,8 @@ def wait_ready(client: ModbusTcpClient, timeout_sec: float = 5.0) -> None:
                 f"Timeout waiting for ready; 6001=0x{val:04X} (status=0x{status:02X})"
             )
 
-        time.sleep(0.2)
+        time.sleep(delay)
+        delay = min(delay * 2, 0.05)
 
 
 def read_window_views(client: ModbusTcpClient, records_per_window: int) -> None:
@@ -132,6 +160,14 @@ def main():
     parser.add_argument("--records", type=int, default=1, help="Records per window (1..8 suggested)")
     args = parser.parse_args()
 
+    # This is a debug tool, so show everything (including acuvim's own
+    # DEBUG output) with the usual [timestamp] prefix.
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format="[%(asctime)s] %(message)s",
+        datefmt="%Y-%m-%dT%H:%M:%S",
+    )
+
     client = ModbusTcpClient(args.host, port=args.port, timeout=3.0)
 
     # pymodbus 3.11.x: set unit_id / device_id
@@ -145,15 +181,25 @@ def main():
         return
     log("Connected.")
 
+    # Disable Nagle: the small write/poll/read frames below are
+    # latency-bound and should not wait for ACK coalescing.
+    try:
+        if client.socket is not None:
+            client.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except (AttributeError, OSError):
+        pass
+
     try:
         # 1) show status
         read_status(client)
 
-        # 2) program window
-        program_window(client, offset=args.offset, records_per_window=args.records)
+        # 2) program window (returns the post-write 6001 value)
+        status_6001 = program_window(
+            client, offset=args.offset, records_per_window=args.records
+        )
 
-        # 3) wait ready
-        wait_ready(client)
+        # 3) wait ready (skipped when the post-write check was READY)
+        wait_ready(client, pre_polled=status_6001)
 
         # 4) read window two ways
         read_window_views(client, records_per_window=args.records)
@@ -0,0 +1,28 @@
+# check_env_versions.py
+#
+# Print the installed versions of the packages this project depends on
+# (see requirements.txt). One metadata.distributions() walk builds a
+# name -> version dict, so adding packages stays O(1) per lookup instead
+# of re-scanning site-packages with metadata.version() for each one.
+
+from importlib import metadata
+
+PACKAGES = [
+    "pymodbus",
+    "python-dateutil",
+    "numpy",
+    "fastapi",
+    "uvicorn",
+    "sqlalchemy",
+    "jinja2",
+]
+
+
+def main():
+    dists = {d.metadata["Name"].lower(): d.version for d in metadata.distributions()}
+    for pkg in PACKAGES:
+        print(f"{pkg} = {dists.get(pkg.lower(), '<not installed>')}")
+
+
+if __name__ == "__main__":
+    main()
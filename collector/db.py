@@ -5,19 +5,52 @@ from datetime import datetime
 from typing import List, Optional
 from .models import MeterConfig
 
+# ciso8601 parses ISO timestamps ~10x faster than the stdlib; it's an
+# optional accelerator, so fall back to datetime.fromisoformat when the
+# C extension isn't installed.
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    _parse_iso = datetime.fromisoformat
+
+
+# Single SQL texts reused for every call: sqlite3 caches compiled
+# statements per connection keyed on the exact statement string, so
+# keeping these module-level avoids re-parsing on each update.
+_UPDATE_POINTER_SQL = """
+    UPDATE meters
+    SET last_record_index = ?,
+        last_collected = ?,
+        updated = ?
+    WHERE id = ?
+"""
+
+_UPDATE_TIMESYNC_SQL = """
+    UPDATE meters
+    SET last_timesync = ?,
+        last_drift_seconds = ?,
+        updated = ?
+    WHERE id = ?
+"""
+
 
 def open_db(path: str) -> sqlite3.Connection:
     conn = sqlite3.connect(path)
     conn.row_factory = sqlite3.Row
+    # WAL + NORMAL makes each commit ~10x cheaper than the default
+    # DELETE journal with synchronous=FULL (one fsync instead of several),
+    # and lets UI readers proceed while the collector writes.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
     return conn
 
 
 def _parse_dt(val: Optional[str]) -> Optional[datetime]:
-    if val is None:
+    if not val:
         return None
     try:
-        return datetime.fromisoformat(val)
-    except Exception:
+        return _parse_iso(val)
+    except (ValueError, TypeError):
         return None
 
 
@@ -54,13 +87,7 @@ def get_meter_by_id(conn: sqlite3.Connection, meter_id: int):
 
 def update_meter_pointer(conn, meter_id, last_record_index, last_collected):
     conn.execute(
-        """
-        UPDATE meters
-        SET last_record_index = ?,
-            last_collected = ?,
-            updated = ?
-        WHERE id = ?
-        """,
+        _UPDATE_POINTER_SQL,
         (
             last_record_index,
             last_collected.isoformat(sep=" "),
@@ -71,15 +98,30 @@ def update_meter_pointer(conn, meter_id, last_record_index, last_collected):
     conn.commit()
 
 
+def update_meter_pointers(conn, rows):
+    """
+    Batch variant of update_meter_pointer: one executemany + one commit
+    (i.e. one fsync) for a whole collection cycle instead of per meter.
+
+    rows: list of (last_record_index, last_collected, meter_id) tuples,
+    with last_collected as a datetime.
+    """
+    if not rows:
+        return
+    now = datetime.now().isoformat(sep=" ")
+    conn.executemany(
+        _UPDATE_POINTER_SQL,
+        [
+            (last_record_index, last_collected.isoformat(sep=" "), now, meter_id)
+            for last_record_index, last_collected, meter_id in rows
+        ],
+    )
+    conn.commit()
+
+
 def update_timesync_info(conn, meter_id, last_timesync, drift_seconds):
     conn.execute(
-        """
-        UPDATE meters
-        SET last_timesync = ?,
-            last_drift_seconds = ?,
-            updated = ?
-        WHERE id = ?
-        """,
+        _UPDATE_TIMESYNC_SQL,
         (
             last_timesync.isoformat(sep=" "),
             drift_seconds,
@@ -88,3 +130,21 @@ def update_timesync_info(conn, meter_id, last_timesync, drift_seconds):
         ),
     )
     conn.commit()
+
+
+def update_timesync_infos(conn, rows):
+    """
+    Batch variant of update_timesync_info; same shape as
+    update_meter_pointers but for (last_timesync, drift_seconds, meter_id).
+    """
+    if not rows:
+        return
+    now = datetime.now().isoformat(sep=" ")
+    conn.executemany(
+        _UPDATE_TIMESYNC_SQL,
+        [
+            (last_timesync.isoformat(sep=" "), drift_seconds, now, meter_id)
+            for last_timesync, drift_seconds, meter_id in rows
+        ],
+    )
+    conn.commit()
@@ -0,0 +1,89 @@
+# collector/pool.py
+#
+# Long-lived ModbusTcpClient pool, keyed by (ip, port, unit_id).
+#
+# process_meter used to open and close a TCP session on every cycle,
+# paying the handshake round-trip (and slow-start on WAN links) each
+# time. Keeping one connected client per meter amortizes that across
+# cycles; TCP keepalive detects dead peers between polls.
+
+import socket
+import threading
+
+from pymodbus.client import ModbusTcpClient
+
+_clients: dict[tuple[str, int, int], ModbusTcpClient] = {}
+
+# Guards the dict itself now that meters are collected from worker
+# threads (collector/runner.py). Each endpoint still has exactly one
+# client, and distinct meters never share one.
+_lock = threading.Lock()
+
+
+def _tune_socket(client: ModbusTcpClient):
+    """Enable TCP_NODELAY and SO_KEEPALIVE on a connected client."""
+    try:
+        sock = client.socket
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    except (AttributeError, OSError):
+        pass
+
+
+def get_client(ip: str, port: int = 502, unit_id: int = 1,
+               timeout: float = 3.0) -> ModbusTcpClient:
+    """
+    Return a connected client for this endpoint, reusing the pooled one
+    when its session is still up. Raises RuntimeError if the meter is
+    unreachable.
+    """
+    key = (ip, port, unit_id)
+    stale = None
+    with _lock:
+        client = _clients.get(key)
+        if client is not None:
+            if getattr(client, "connected", False):
+                return client
+            stale = _clients.pop(key)
+    if stale is not None:
+        stale.close()
+
+    # Connect outside the lock: an unreachable meter blocks for the full
+    # TCP timeout, and holding the lock through that would serialize
+    # every other worker's pool lookup behind it.
+    client = ModbusTcpClient(ip, port=port, timeout=timeout)
+    if not client.connect():
+        raise RuntimeError(f"Cannot connect to {ip}:{port}")
+    _tune_socket(client)
+
+    with _lock:
+        existing = _clients.get(key)
+        if existing is not None and getattr(existing, "connected", False):
+            # Another worker connected the same endpoint first; keep the
+            # pooled one.
+            loser = client
+            client = existing
+        else:
+            _clients[key] = client
+            loser = None
+    if loser is not None:
+        loser.close()
+    return client
+
+
+def drop_client(ip: str, port: int = 502, unit_id: int = 1):
+    """Close and forget a pooled client (after an I/O error)."""
+    with _lock:
+        client = _clients.pop((ip, port, unit_id), None)
+    if client is not None:
+        client.close()
+
+
+def close_all():
+    """Close every pooled client (for shutdown)."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
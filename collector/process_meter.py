@@ -11,12 +11,17 @@
 
 from datetime import datetime
 import os
+import socket
+import time
 from typing import Tuple
 
+import numpy as np
 from pymodbus.client import ModbusTcpClient
+from pymodbus.exceptions import ModbusException
 
 from .db import update_meter_pointer
 from .log_parser import retrieve_records
+from .pool import drop_client, get_client
 
 # ------------------------------
 # Modbus constants
@@ -30,10 +35,53 @@ RECORD_SIZE_WORDS = 14
 WINDOW_MAX_WORDS = 123
 MAX_RECORDS_PER_WINDOW = WINDOW_MAX_WORDS // RECORD_SIZE_WORDS  # 8
 
+# Upper bound on how many windows one process_meter call will read when
+# catching up a stale pointer, so a very old pointer can't stall a cycle.
+MAX_CATCHUP_WINDOWS = 16
+
+
+def disable_nagle(client: ModbusTcpClient):
+    """
+    Set TCP_NODELAY on a connected client's socket. The per-meter cycle
+    is several small back-to-back write/read ADUs, and Nagle can hold
+    each one up to ~40ms waiting to coalesce ACKs.
+    """
+    try:
+        sock = client.socket
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except (AttributeError, OSError):
+        # Tolerate pymodbus version differences; purely an optimization.
+        pass
+
+
+# log() runs dozens of times per meter per cycle, and strftime costs a
+# few µs through the locale layer. Cache the rendered prefix for the
+# current minute and integer-format only the seconds.
+_cached_min = -1
+_cached_prefix = ""
+
 
 def log(msg: str):
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{ts}] {msg}")
+    global _cached_min, _cached_prefix
+    s = int(time.time())
+    if s // 60 != _cached_min:
+        _cached_prefix = time.strftime("%Y-%m-%d %H:%M:", time.localtime(s))
+        _cached_min = s // 60
+    print(f"[{_cached_prefix}{s % 60:02d}] {msg}")
+
+
+# Output folders already confirmed to exist, so the steady-state path
+# skips the makedirs stat() per meter per cycle. The cycle driver
+# pre-populates this at startup (collector/runner.py).
+_known_folders: set[str] = set()
+
+
+def ensure_output_folder(folder: str):
+    """makedirs once per distinct folder; afterwards a set lookup."""
+    if folder not in _known_folders:
+        os.makedirs(folder, exist_ok=True)
+        _known_folders.add(folder)
 
 
 # ------------------------------------------------------------
@@ -63,11 +111,9 @@ def read_log_status(client: ModbusTcpClient, unit_id: int) -> Tuple[int, int, in
     if not res or res.isError():
         raise RuntimeError("Failed to read LOG_STATUS_BASE (0x6100)")
 
-    regs = res.registers
-    log_type = regs[0]
-    max_records = regs[1]
-    used_records = regs[3]
-    record_size = regs[4]
+    # One tuple unpack instead of four indexed lookups (same pattern as
+    # read_meter_time in time_sync_integration.py).
+    log_type, max_records, _, used_records, record_size = res.registers[:5]
 
     log(f"[DEBUG] read_log_status: log_type={log_type}, "
         f"max_records={max_records}, used_records={used_records}, "
@@ -83,35 +129,57 @@ def read_log_status(client: ModbusTcpClient, unit_id: int) -> Tuple[int, int, in
 # Read one window from REG_WINDOW (0x6004)
 # ------------------------------------------------------------
 
-def read_window(client: ModbusTcpClient, unit_id: int, offset_words: int) -> list[int]:
+def read_window(client: ModbusTcpClient, unit_id: int, offset_words: int) -> np.ndarray:
     """
     Read a raw window (up to 123 words) from the log.
 
     We assume:
         - 0x6002 = offset_hi, 0x6003 = offset_lo
         - 0x6004 returns a block of up to 123 words starting at that offset.
+
+    Uses FC23 (Read/Write Multiple Registers): the offset write to
+    6002/6003 and the window read from 6004 go out as ONE transaction
+    (the spec performs the write before the read), replacing the old
+    write_register + write_register + read sequence — 3 RTTs down to 1.
     """
     hi = (offset_words >> 16) & 0xFFFF
     lo = offset_words & 0xFFFF
 
     log(f"[DEBUG] read_window: offset_words={offset_words} (hi=0x{hi:04X}, lo=0x{lo:04X})")
 
-    # Set offset
-    w1 = client.write_register(address=REG_OFFSET_HI, value=hi, device_id=unit_id)
-    w2 = client.write_register(address=REG_OFFSET_LO, value=lo, device_id=unit_id)
-    if (not w1 or w1.isError()) or (not w2 or w2.isError()):
-        raise RuntimeError("Failed to write window offset (6002/6003)")
-
-    # Read the window
-    res = client.read_holding_registers(
-        address=REG_WINDOW,
-        count=WINDOW_MAX_WORDS,
+    res = client.readwrite_registers(
+        read_address=REG_WINDOW,
+        read_count=WINDOW_MAX_WORDS,
+        write_address=REG_OFFSET_HI,
+        values=[hi, lo],
         device_id=unit_id,
     )
     if not res or res.isError():
-        raise RuntimeError("Failed to read window data from 0x6004")
-
-    regs = res.registers
+        # Some firmware revisions reject FC23 (IllegalFunction). Fall back
+        # to one FC16 for both offset words plus an FC03 read — still only
+        # 2 RTTs, versus 3 for the original per-register FC06 writes.
+        log("[DEBUG] read_window: FC23 rejected – falling back to FC16+FC03")
+        w = client.write_registers(
+            address=REG_OFFSET_HI,
+            values=[hi, lo],
+            device_id=unit_id,
+        )
+        if not w or w.isError():
+            raise RuntimeError("Failed to set offset (6002/6003)")
+        res = client.read_holding_registers(
+            address=REG_WINDOW,
+            count=WINDOW_MAX_WORDS,
+            device_id=unit_id,
+        )
+        if not res or res.isError():
+            raise RuntimeError("Failed to read window (0x6004)")
+
+    # Hand the decoder a uint16 ndarray: one bulk conversion here instead
+    # of retrieve_records walking a list of PyLongs element by element.
+    # (pymodbus 3.x doesn't expose the raw ADU bytes to client code, so
+    # this conversion from res.registers is as close to zero-copy as we
+    # can get without patching its framer.)
+    regs = np.asarray(res.registers, dtype=np.uint16)
     log(f"[DEBUG] read_window: got {len(regs)} words, "
         f"first 20 = {' '.join(f'{w:04X}' for w in regs[:20])}")
     return regs
@@ -121,7 +189,7 @@ def read_window(client: ModbusTcpClient, unit_id: int, offset_words: int) -> lis
 # Main per-meter logic
 # ------------------------------------------------------------
 
-def process_meter(meter, conn):
+def process_meter(meter, conn, pointer_updates=None):
     """
     High-level per-meter processing:
         - Reads the latest log window,
@@ -134,105 +202,134 @@ def process_meter(meter, conn):
         "the NEXT global record index to process".
     So on first run it will be 0, and we treat all records in the window
     as new; after processing index N-1 we store last_record_index = N.
+
+    Connections come from the long-lived pool (collector/pool.py) and are
+    kept open across cycles; on an I/O error the session is rebuilt and
+    the collection retried once.
+
+    When pointer_updates (a list) is given, the DB pointer write is
+    appended to it as (last_record_index, last_collected, meter_id)
+    instead of committed immediately, so a cycle driver can flush all
+    meters in one transaction (see collector/runner.py).
     """
     log(f"Processing {meter.serial_number}...")
 
-    client = ModbusTcpClient(meter.ip_address, port=502, timeout=3.0)
-    if not client.connect():
-        raise RuntimeError(f"Cannot connect to {meter.serial_number} at {meter.ip_address}")
+    try:
+        client = get_client(meter.ip_address, unit_id=meter.unit_id)
+    except RuntimeError:
+        raise RuntimeError(
+            f"Cannot connect to {meter.serial_number} at {meter.ip_address}"
+        )
 
     try:
-        # 1) Read log status
-        _, used_records, record_size = read_log_status(client, meter.unit_id)
-
-        if used_records == 0:
-            log("[INFO] Log is empty (used_records=0). Nothing to do.")
-            return None
-
-        # Pointer semantics: this is "next index to process"
-        next_index = meter.last_record_index or 0
-        log(f"[DEBUG] DB pointer last_record_index (next index) = {next_index}")
-
-        # We'll read ONLY the latest window (last up to 8 records).
-        # These correspond to global indices:
-        #   first_idx = used_records - window_size
-        #   last_idx  = used_records - 1
-        #
-        # That is exactly what Acuview shows as the "last N records".
-        window_size = min(MAX_RECORDS_PER_WINDOW, used_records)
-        first_idx = used_records - window_size
-        last_idx = used_records - 1
-
-        log(f"[DEBUG] Window indices: first_idx={first_idx}, last_idx={last_idx}, "
+        return _collect(meter, conn, client, pointer_updates)
+    except (OSError, ModbusException) as e:
+        # Stale pooled session (meter rebooted, NAT timeout, ...):
+        # reconnect once and retry before giving up.
+        log(f"[WARN] I/O error for {meter.serial_number}: {e} – reconnecting")
+        drop_client(meter.ip_address, unit_id=meter.unit_id)
+        client = get_client(meter.ip_address, unit_id=meter.unit_id)
+        return _collect(meter, conn, client, pointer_updates)
+
+
+def _collect(meter, conn, client: ModbusTcpClient, pointer_updates=None):
+    # 1) Read log status
+    _, used_records, record_size = read_log_status(client, meter.unit_id)
+
+    if used_records == 0:
+        log("[INFO] Log is empty (used_records=0). Nothing to do.")
+        return None
+
+    # Pointer semantics: this is "next index to process"
+    next_index = meter.last_record_index or 0
+    log(f"[DEBUG] DB pointer last_record_index (next index) = {next_index}")
+
+    missing = used_records - next_index
+    if missing <= 0:
+        log("No new records since last_record_index pointer.")
+        return None
+
+    # 2) Read as many windows as needed to catch the pointer up to
+    #    used_records (previously only the single latest window was
+    #    read, so falling behind by more than 8 records lost data).
+    #    Bounded by MAX_CATCHUP_WINDOWS per cycle; any remainder is
+    #    picked up next cycle.
+    windows_needed = (missing + MAX_RECORDS_PER_WINDOW - 1) // MAX_RECORDS_PER_WINDOW
+    windows = min(windows_needed, MAX_CATCHUP_WINDOWS)
+
+    log(f"[DEBUG] Catch-up: missing={missing}, "
+        f"windows={windows} (of {windows_needed} needed)")
+
+    # 3+4) Read each window, decode, and attach global indices
+    new_records = []
+    for w in range(windows):
+        first_idx = next_index + w * MAX_RECORDS_PER_WINDOW
+        window_size = min(MAX_RECORDS_PER_WINDOW, used_records - first_idx)
+        if window_size <= 0:
+            break
+
+        log(f"[DEBUG] Window {w}: first_idx={first_idx}, "
             f"window_size={window_size}")
 
-        # 2) Read that window
         offset_words = first_idx * RECORD_SIZE_WORDS
         raw_window = read_window(client, meter.unit_id, offset_words)
 
-        # 3) Decode records from the window
-        decoded = retrieve_records(raw_window)
+        decoded = retrieve_records(raw_window[: window_size * RECORD_SIZE_WORDS])
         if not decoded:
-            log("[DEBUG] Decoded 0 records from window – nothing to write.")
-            return None
-
-        # 4) Attach indices and filter on pointer
-        new_records = []
-        for i, rec in enumerate(decoded):
-            global_index = first_idx + i  # 0-based index within the full log
-
-            if global_index < next_index:
-                # Already processed – skip
-                continue
-
-            # Add index + seq (for now seq == index; we can refine later if needed)
-            rec_with_idx = {
-                "index": global_index,
-                "seq": global_index,
-                **rec,
-            }
-            new_records.append(rec_with_idx)
-
-        log(f"[DEBUG] New records in this window after pointer filter: "
-            f"{len(new_records)}")
-
-        if not new_records:
-            log("No new records since last_record_index pointer.")
-            return None
-
-        # 5) Ensure output folder exists
-        output_folder = meter.output_folder or "./data"
-        os.makedirs(output_folder, exist_ok=True)
-
-        # 6) Build CSV path
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        csv_path = os.path.join(output_folder, f"{meter.serial_number}_{ts}.csv")
-
-        # 7) Write CSV with your preferred columns
-        with open(csv_path, "w", encoding="utf-8") as f:
-            f.write("serial,index,seq,timestamp,kwh_import,kwh_export,kvarh_import,kvarh_export\n")
-            for rec in new_records:
-                f.write(
-                    f"{meter.serial_number},"
-                    f"{rec['index']},"
-                    f"{rec['seq']},"
-                    f"{rec['timestamp']},"
-                    f"{rec['kwh_import']},"
-                    f"{rec['kwh_export']},"
-                    f"{rec['kvarh_import']},"
-                    f"{rec['kvarh_export']}\n"
-                )
-
-        log(f"CSV written: {csv_path}")
-
-        # 8) Update DB pointer:
-        #     we have now processed everything up to used_records-1,
-        #     so the NEXT index to process is used_records.
-        new_pointer = used_records
+            log(f"[DEBUG] Decoded 0 records from window {w} – stopping.")
+            break
+
+        # Windows start exactly at the pointer, so global index =
+        # first_idx + window slot. retrieve_records reports each
+        # record's original slot, so indices stay correct even when it
+        # drops padding or corrupt records mid-window. Rows are plain
+        # tuples (index, seq, timestamp, energies...); no per-record
+        # dicts or string-key lookups on the CSV path.
+        # (seq == index for now; we can refine later if needed)
+        new_records.extend(
+            (first_idx + rec.slot, first_idx + rec.slot) + rec[1:]
+            for rec in decoded
+        )
+
+    log(f"[DEBUG] New records across {windows} window(s): {len(new_records)}")
+
+    if not new_records:
+        log("No new records decoded.")
+        return None
+
+    # 5) Ensure output folder exists (no-op after the first meter/cycle)
+    output_folder = meter.output_folder or "./data"
+    ensure_output_folder(output_folder)
+
+    # 6) Build CSV path
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    csv_path = os.path.join(output_folder, f"{meter.serial_number}_{ts}.csv")
+
+    # 7) Write CSV with your preferred columns.
+    #    Render the whole file into one buffer and issue a single
+    #    write: no per-row file-object calls at all.
+    serial = meter.serial_number
+    lines = ["serial,index,seq,timestamp,kwh_import,kwh_export,kvarh_import,kvarh_export\n"]
+    lines.extend(
+        "%s,%d,%d,%s,%s,%s,%s,%s\n" % ((serial,) + row)
+        for row in new_records
+    )
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        f.write("".join(lines))
+
+    log(f"CSV written: {csv_path}")
+
+    # 8) Update DB pointer: the NEXT index to process is one past the
+    #    last record we actually wrote (== used_records unless the
+    #    catch-up cap kicked in).
+    new_pointer = new_records[-1][0] + 1
+    if pointer_updates is not None:
+        # Deferred: the cycle driver commits all meters in one batch.
+        pointer_updates.append((new_pointer, datetime.now(), meter.id))
+        log(f"[DEBUG] Queued last_record_index -> {new_pointer}")
+    else:
         update_meter_pointer(conn, meter.id, new_pointer, datetime.now())
         log(f"[DEBUG] Updated DB last_record_index -> {new_pointer}")
 
-        return csv_path
+    return csv_path
 
-    finally:
-        client.close()
@@ -2,6 +2,7 @@
 
 from pymodbus.client import ModbusTcpClient
 import datetime as dt
+import logging
 import os
 
 YEAR_REG = 0x1040
@@ -14,15 +15,28 @@ TIME_REG_BASE = YEAR_REG
 
 SECONDS_ALLOWED_DRIFT = 60   # 1-minute tolerance
 
+# Console + diagnostics file, both set up once at import. Previously each
+# log() call did a full open/write/close on time_sync.log; the FileHandler
+# keeps the file open, and the formatter caches asctime per record.
+_logger = logging.getLogger(__name__)
+if not _logger.handlers:
+    _fmt = logging.Formatter("[%(asctime)s] %(message)s", datefmt="%Y-%m-%dT%H:%M:%S")
 
-def log(msg: str):
-    ts = dt.datetime.now().isoformat(timespec="seconds")
-    entry = f"[{ts}] {msg}"
-    print(entry)
+    _stream = logging.StreamHandler()
+    _stream.setFormatter(_fmt)
+    _logger.addHandler(_stream)
 
     os.makedirs("./diagnostics", exist_ok=True)
-    with open("./diagnostics/time_sync.log", "a", encoding="utf-8") as f:
-        f.write(entry + "\n")
+    _file = logging.FileHandler("./diagnostics/time_sync.log", encoding="utf-8", delay=True)
+    _file.setFormatter(_fmt)
+    _logger.addHandler(_file)
+
+    _logger.setLevel(logging.INFO)
+    _logger.propagate = False
+
+
+def log(msg: str):
+    _logger.info(msg)
 
 
 def read_meter_time(client: ModbusTcpClient):
@@ -10,7 +10,6 @@ Workflow:
 """
 
 import argparse
-import csv
 import math
 from datetime import datetime
 from pathlib import Path
@@ -59,29 +58,40 @@ def _records_to_csv(
 
     csv_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with csv_path.open("w", newline="") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=fieldnames,
-            delimiter="\t",
-            quoting=csv.QUOTE_NONE,
-            escapechar="\\",
-        )
-        writer.writeheader()
+    serial_text = serial or ""
+
+    # One precompiled %-template per row: no per-field f-string formatting
+    # and no csv machinery — the columns are plain numbers plus a
+    # timestamp, and the delimiter is a tab, so direct writes are safe.
+    row_fmt = "%s\t%d\t%d\t%s\t%.1f\t%.1f\t%.1f\t%.1f\n"
+
+    # Records are minute-interval, so ≤1440 per date: cache the rendered
+    # "YYYY/MM/DD " prefix per day and format only HH:MM with integer
+    # formatting, instead of a full strftime per record.
+    last_date = None
+    last_prefix = ""
 
+    with csv_path.open("w", newline="", buffering=1 << 20) as f:
+        f.write("\t".join(fieldnames) + "\n")
+        write = f.write
         for r in records:
-            ts_text = r.timestamp.strftime("%Y/%m/%d %H:%M")
-            writer.writerow(
-                {
-                    "serial": serial or "",
-                    "index": r.index,
-                    "seq": r.seq,
-                    "timestamp": ts_text,
-                    "kwh_import": f"{r.kwh_import:.1f}",
-                    "kwh_export": f"{r.kwh_export:.1f}",
-                    "kvarh_import": f"{r.kvarh_import:.1f}",
-                    "kvarh_export": f"{r.kvarh_export:.1f}",
-                }
+            ts = r.timestamp
+            d = ts.date()
+            if d != last_date:
+                last_prefix = d.strftime("%Y/%m/%d ")
+                last_date = d
+            write(
+                row_fmt
+                % (
+                    serial_text,
+                    r.index,
+                    r.seq,
+                    "%s%02d:%02d" % (last_prefix, ts.hour, ts.minute),
+                    r.kwh_import,
+                    r.kwh_export,
+                    r.kvarh_import,
+                    r.kvarh_export,
+                )
             )
 
 
@@ -1,5 +1,5 @@
 from pathlib import Path
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from meter_ui.models import Base
@@ -7,10 +7,53 @@ from meter_ui.models import Base
 DB_PATH = Path(__file__).resolve().parent.parent / "meters.db"
 DATABASE_URL = f"sqlite:///{DB_PATH}"
 
-engine = create_engine(DATABASE_URL, echo=False, connect_args={"check_same_thread": False})
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    connect_args={"check_same_thread": False},
+    pool_pre_ping=True,
+)
 SessionLocal = sessionmaker(bind=engine)
 
 
+def get_db():
+    """FastAPI dependency: yield a session and always close it.
+
+    Routes used to call SessionLocal() directly and never close, leaking
+    a pooled connection per request; going through Depends(get_db) both
+    reuses pooled connections and guarantees the close.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_conn, connection_record):
+    """
+    Tune each raw SQLite connection as it joins the pool. WAL +
+    synchronous=NORMAL makes commits far cheaper than the default
+    DELETE-journal/FULL (one fsync instead of several) and lets the UI
+    read while the collector writes.
+    """
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.execute("PRAGMA mmap_size=268435456")
+    cur.execute("PRAGMA cache_size=-20000")  # ~20 MB page cache
+    cur.close()
+
+
 def init_db() -> None:
     """Create tables if they do not exist."""
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
+    # Lightweight migration for databases created before the composite
+    # index existed (create_all won't touch existing tables).
+    with engine.connect() as conn:
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_meters_enabled_id ON meters(enabled, id)"
+        )
+        conn.commit()
\ No newline at end of file
@@ -1,16 +1,20 @@
 from __future__ import annotations
 
-import platform
-import subprocess
+import asyncio
+import threading
+import time
 from pathlib import Path
 
-from fastapi import FastAPI, Form, Query, Request
+from fastapi import Depends, FastAPI, Form, Query, Request
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
 from pymodbus.client import ModbusTcpClient
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
 
-from meter_ui.database import init_db, SessionLocal
+from meter_ui.database import get_db, init_db
 from meter_ui.models import Meter
 
 app = FastAPI(title="VuWatt Meter Management UI")
@@ -19,13 +23,34 @@ BASE_DIR = Path(__file__).resolve().parent
 app.mount("/static", StaticFiles(directory=BASE_DIR / "static"), name="static")
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 
+# Persist compiled templates across process restarts so the first
+# request after a (re)start skips Jinja's compile step. The cache lives
+# inside the app tree (next to templates/), not a world-writable temp
+# dir: Jinja loads marshaled code objects from here, so the directory
+# must be one only we can write to.
+_jinja_cache_dir = BASE_DIR / ".jinja_cache"
+_jinja_cache_dir.mkdir(mode=0o700, exist_ok=True)
+templates.env.bytecode_cache = FileSystemBytecodeCache(str(_jinja_cache_dir))
+
 init_db()
 
 
 @app.get("/", response_class=HTMLResponse)
-def home(request: Request):
-    db = SessionLocal()
-    meters = db.query(Meter).order_by(Meter.id).all()
+def home(request: Request, db: Session = Depends(get_db)):
+    # Select only the columns meters.html renders: Row tuples expose the
+    # same attribute names without hydrating full Meter objects (or the
+    # output_folder text) per row. The edit page still loads the full
+    # entity.
+    meters = db.execute(
+        select(
+            Meter.id,
+            Meter.serial_number,
+            Meter.ip_address,
+            Meter.unit_id,
+            Meter.model,
+            Meter.site_name,
+        ).order_by(Meter.id)
+    ).all()
     return templates.TemplateResponse("meters.html", {"request": request, "meters": meters})
 
 
@@ -43,8 +68,8 @@ def meter_save(
     baud_rate: int = Form(9600),
     model: str = Form("Acuvim-L"),
     site_name: str = Form(""),
+    db: Session = Depends(get_db),
 ):
-    db = SessionLocal()
     new_meter = Meter(
         serial_number=serial_number,
         ip_address=ip_address,
@@ -59,10 +84,22 @@ def meter_save(
     return RedirectResponse(url="/", status_code=302)
 
 
+def bulk_save_meters(db: Session, rows: list[dict]) -> None:
+    """Insert many meters in one executemany statement.
+
+    For import tools: a single insert() over the rows skips the ORM
+    unit-of-work pass that an add() loop pays per object. meter_save
+    stays ORM-based since single rows want the identity map / id return.
+    """
+    if not rows:
+        return
+    db.execute(insert(Meter), rows)
+    db.commit()
+
+
 @app.get("/meter/{meter_id}/edit", response_class=HTMLResponse)
-def meter_edit(request: Request, meter_id: int):
-    db = SessionLocal()
-    meter = db.query(Meter).filter(Meter.id == meter_id).first()
+def meter_edit(request: Request, meter_id: int, db: Session = Depends(get_db)):
+    meter = db.get(Meter, meter_id)
     return templates.TemplateResponse("meter_edit.html", {"request": request, "meter": meter})
 
 
@@ -76,42 +113,126 @@ def meter_update(
     baud_rate: int = Form(9600),
     model: str = Form("Acuvim-L"),
     site_name: str = Form(""),
+    db: Session = Depends(get_db),
 ):
-    db = SessionLocal()
-    meter = db.query(Meter).filter(Meter.id == meter_id).first()
-    meter.serial_number = serial_number
-    meter.ip_address = ip_address
-    meter.unit_id = unit_id
-    meter.baud_rate = baud_rate
-    meter.model = model
-    meter.site_name = site_name
+    # One UPDATE statement instead of SELECT + attribute mutation:
+    # halves the DB round-trips on the save path.
+    db.execute(
+        update(Meter)
+        .where(Meter.id == meter_id)
+        .values(
+            serial_number=serial_number,
+            ip_address=ip_address,
+            unit_id=unit_id,
+            baud_rate=baud_rate,
+            model=model,
+            site_name=site_name,
+        )
+    )
     db.commit()
 
     return RedirectResponse(url="/", status_code=302)
 
 
 @app.get("/meter/{meter_id}/delete")
-def meter_delete(meter_id: int):
-    db = SessionLocal()
-    meter = db.query(Meter).filter(Meter.id == meter_id).first()
-    if meter:
-        db.delete(meter)
-        db.commit()
+def meter_delete(meter_id: int, db: Session = Depends(get_db)):
+    # Single DELETE; no need to load the row first.
+    db.execute(delete(Meter).where(Meter.id == meter_id))
+    db.commit()
     return RedirectResponse(url="/", status_code=302)
 
 
-@app.get("/api/ping")
-def api_ping(ip: str = Query(...)):
-    """Ping a device and return whether it's reachable."""
-    params = "-n" if platform.system().lower() == "windows" else "-c"
-    command = ["ping", params, "1", ip]
+async def _probe(ip: str, timeout: float = 1.0) -> bool:
+    """TCP-connect probe on the Modbus port.
 
+    What the UI actually cares about is Modbus reachability, so a
+    connect to port 502 is a better signal than ICMP — and unlike the
+    old subprocess ping it doesn't fork or block the event loop.
+    """
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(ip, 502), timeout=timeout
+        )
+    except Exception:
+        return False
+    writer.close()
     try:
-        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        reachable = result.returncode == 0
-        return JSONResponse({"reachable": reachable})
+        await writer.wait_closed()
     except Exception:
-        return JSONResponse({"reachable": False})
+        pass
+    return True
+
+
+@app.get("/api/ping")
+async def api_ping(ip: str = Query(...)):
+    """Probe a device and return whether it's reachable."""
+    return JSONResponse({"reachable": await _probe(ip)})
+
+
+@app.get("/api/ping_many")
+async def api_ping_many(ips: str = Query(..., description="Comma-separated IPs")):
+    """Probe many devices concurrently (one fan-out, ~1s total)."""
+    ip_list = [ip.strip() for ip in ips.split(",") if ip.strip()]
+    results = await asyncio.gather(*[_probe(ip) for ip in ip_list])
+    return JSONResponse(dict(zip(ip_list, results)))
+
+
+# Pooled Modbus clients for test_device, keyed by (ip, unit): the UI
+# polls the same meters repeatedly, and reconnecting per request pays
+# the TCP handshake every time. Entries idle for more than 30s are
+# closed opportunistically on the next access (these handlers run sync
+# in FastAPI's threadpool, hence a threading.Lock rather than the
+# asyncio kind).
+_modbus_pool: dict[tuple[str, int], tuple[ModbusTcpClient, float]] = {}
+_modbus_pool_lock = threading.Lock()
+_MODBUS_POOL_IDLE_SEC = 30.0
+
+
+def _get_modbus_client(ip: str, unit: int) -> ModbusTcpClient | None:
+    now = time.monotonic()
+    stale = None
+    with _modbus_pool_lock:
+        for key, (cached, last_used) in list(_modbus_pool.items()):
+            if now - last_used > _MODBUS_POOL_IDLE_SEC:
+                cached.close()
+                del _modbus_pool[key]
+
+        entry = _modbus_pool.pop((ip, unit), None)
+        if entry is not None:
+            client = entry[0]
+            if getattr(client, "connected", False):
+                _modbus_pool[(ip, unit)] = (client, now)
+                return client
+            stale = client
+    if stale is not None:
+        stale.close()
+
+    # Connect outside the lock so a dead meter's 2s timeout doesn't
+    # block probes of other devices running in parallel.
+    client = ModbusTcpClient(ip, port=502, timeout=2)
+    if not client.connect():
+        return None
+
+    with _modbus_pool_lock:
+        existing = _modbus_pool.get((ip, unit))
+        if existing is not None and getattr(existing[0], "connected", False):
+            # Lost a connect race for the same device; keep the pooled one.
+            loser = client
+            client = existing[0]
+            _modbus_pool[(ip, unit)] = (client, time.monotonic())
+        else:
+            _modbus_pool[(ip, unit)] = (client, time.monotonic())
+            loser = None
+    if loser is not None:
+        loser.close()
+    return client
+
+
+def _drop_modbus_client(ip: str, unit: int) -> None:
+    with _modbus_pool_lock:
+        entry = _modbus_pool.pop((ip, unit), None)
+    if entry is not None:
+        entry[0].close()
 
 
 @app.get("/api/test_device")
@@ -121,12 +242,11 @@ def test_device(ip: str = Query(...), unit: int = Query(1)):
     If successful → device is reachable & alive.
     """
 
-    client = ModbusTcpClient(ip, port=502, timeout=2)
+    client = _get_modbus_client(ip, unit)
+    if client is None:
+        return {"reachable": False}
 
     try:
-        if not client.connect():
-            return {"reachable": False}
-
         result = client.read_holding_registers(0x1040, 6, slave=unit)
 
         if result.isError():
@@ -138,7 +258,6 @@ def test_device(ip: str = Query(...), unit: int = Query(1)):
         return {"reachable": True, "device_time": device_time}
 
     except Exception:
-        return {"reachable": False}
-
-    finally:
-        client.close()
\ No newline at end of file
+        # Stale session: forget it so the next call reconnects.
+        _drop_modbus_client(ip, unit)
+        return {"reachable": False}
\ No newline at end of file
@@ -3,19 +3,64 @@ from __future__ import annotations
 import argparse
 import csv
 import math
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
+
 from acuvim import (
     AcuvimClient,
     RECORD_INTERVAL_MINUTES,
 )
 
+# numba is an optional accelerator for the CSV fixed-point conversion;
+# the NumPy fallback is vectorized anyway, so it's never required.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _to_millis(values):
+        out = np.empty(values.shape[0], np.int64)
+        for i in range(values.shape[0]):
+            out[i] = np.int64(round(values[i] * 1000.0))
+        return out
+else:
+    def _to_millis(values):
+        return np.rint(values * 1000.0).astype(np.int64)
+
+
+# Cache the rendered timestamp per second: _log fires per progress line
+# during bulk retrieval and datetime.now().isoformat adds up.
+_last_ts_s = 0
+_last_ts_str = ""
+
 
 def _log(msg: str) -> None:
-    ts = datetime.now().isoformat(timespec="seconds")
-    print(f"[{ts}] {msg}")
+    global _last_ts_s, _last_ts_str
+    now_s = int(time.time())
+    if now_s != _last_ts_s:
+        _last_ts_str = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(now_s))
+        _last_ts_s = now_s
+    print(f"[{_last_ts_str}] {msg}")
+
+
+def _milli_text(m: int) -> str:
+    """Render fixed-point millis as '<int>.<3 digits>'.
+
+    The sign is handled explicitly: Python's floor divmod would turn
+    -500 into (-1, 500) and print -0.5 as \"-1.500\", and the energy
+    accumulators can legitimately go negative (they are sign-extended
+    i32s in acuvim.py).
+    """
+    if m < 0:
+        return "-%d.%03d" % divmod(-m, 1000)
+    return "%d.%03d" % divmod(m, 1000)
 
 
 def _default_csv_filename(serial: str) -> Path:
@@ -47,25 +92,48 @@ def _records_to_csv(
         "kvarh_export",
     ]
 
-    with csv_path.open("w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for r in records:
-            ts_text = r.timestamp.strftime("%Y-%m-%d %H:%M:%S")  # <-- FIXED FORMAT
-            writer.writerow(
-                {
-                    "serial": serial or "",
-                    "index": r.index,
-                    "seq": r.seq,
-                    "timestamp": ts_text,
-                    "kwh_import": f"{r.kwh_import:.3f}",
-                    "kwh_export": f"{r.kwh_export:.3f}",
-                    "kvarh_import": f"{r.kvarh_import:.3f}",
-                    "kvarh_export": f"{r.kvarh_export:.3f}",
-                }
+    # Convert the four energy columns to fixed-point millis in bulk
+    # (numba-jitted when available), so the row loop formats them with
+    # integer divmod instead of 4x float f-string formatting per record.
+    records = list(records)
+    millis = [
+        _to_millis(np.array([getattr(r, col) for r in records], dtype=np.float64))
+        for col in ("kwh_import", "kwh_export", "kvarh_import", "kvarh_export")
+    ]
+
+    serial_text = serial or ""
+
+    # Positional csv.writer + a lazy generator: writerows keeps the row
+    # loop in C, with no per-row dict or field-key resolution, and the
+    # 1 MB buffer batches the underlying writes.
+    def _rows():
+        # Records arrive one per minute, so the "YYYY-MM-DD HH:MM"
+        # prefix repeats; render it once per minute group and format
+        # only the seconds per row.
+        last_minute_key = None
+        last_prefix = ""
+        for i, r in enumerate(records):
+            ts = r.timestamp
+            mk = (ts.year, ts.month, ts.day, ts.hour, ts.minute)
+            if mk != last_minute_key:
+                last_prefix = ts.strftime("%Y-%m-%d %H:%M")  # <-- FIXED FORMAT
+                last_minute_key = mk
+            yield (
+                serial_text,
+                r.index,
+                r.seq,
+                f"{last_prefix}:{ts.second:02d}",
+                _milli_text(millis[0][i]),
+                _milli_text(millis[1][i]),
+                _milli_text(millis[2][i]),
+                _milli_text(millis[3][i]),
             )
 
+    with csv_path.open("w", newline="", buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows(_rows())
+
 
 def main() -> None:
     args = _parse_args()
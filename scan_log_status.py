@@ -9,7 +9,8 @@ client.connect()
 
 print("Reading register block 0x6100 – 0x6120 ...")
 
-res = client.read_holding_registers(address=0x6100, count=10, device_id=UNIT)
+# Whole block in one PDU (33 words) instead of 10 at a time.
+res = client.read_holding_registers(address=0x6100, count=33, device_id=UNIT)
 
 if not res or res.isError():
     print("ERROR reading registers")
@@ -38,19 +38,17 @@ if not os.path.exists(DB_PATH):
 conn = open_db(DB_PATH)
 
 # -------------------------------------------------------------------
-# Show schema in full detail
+# Show schema in full detail (one PRAGMA pass: print + collect names)
 # -------------------------------------------------------------------
-cur = conn.execute("PRAGMA table_info(meters)")
-rows = cur.fetchall()
-
+existing = set()
 print("\nDB Columns:")
-for col in rows:
+for col in conn.execute("PRAGMA table_info(meters)"):
+    existing.add(col[1])
     print(f" - cid={col[0]} | name={col[1]} | type={col[2]} | notnull={col[3]} | dflt={col[4]} | pk={col[5]}")
 
 # If the two required fields are missing, we know immediately.
 print("\nSchema check:")
 needed = {"last_record_index", "output_folder"}
-existing = {col[1] for col in rows}
 missing = needed - existing
 if missing:
     print(f"❌ Missing required columns: {missing}")
@@ -2,16 +2,29 @@
 
 from __future__ import annotations
 
+import time
 from datetime import datetime
 from typing import List
 
+import numpy as np
+
+# log() can fire at high rates during bulk retrieval; cache the rendered
+# timestamp for the current second instead of building a datetime and
+# isoformat string per call.
+_last_ts_s = 0
+_last_ts_str = ""
+
 
 def log(msg: str) -> None:
     """
     Simple timestamped logger used across the project.
     """
-    ts = datetime.now().isoformat(timespec="seconds")
-    print(f"[{ts}] {msg}")
+    global _last_ts_s, _last_ts_str
+    now_s = int(time.time())
+    if now_s != _last_ts_s:
+        _last_ts_str = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(now_s))
+        _last_ts_s = now_s
+    print(f"[{_last_ts_str}] {msg}")
 
 
 def decode_log_timestamp(words: List[int]) -> datetime:
@@ -55,6 +68,58 @@ def decode_log_timestamp(words: List[int]) -> datetime:
             f"hour={hour}, minute={minute}, second={second}"
         ) from e
 
+def decode_log_timestamps(arr: np.ndarray) -> np.ndarray:
+    """
+    Vectorized form of decode_log_timestamp for bulk parsing.
+
+    Takes an (N, 3) uint16 array of raw timestamp words and returns an
+    (N,) datetime64[s] array. The byte fields are split with whole-column
+    shifts/masks and assembled through NumPy's calendar arithmetic, so N
+    records cost a handful of array ops instead of N datetime() calls.
+
+    Raises ValueError if any row holds an impossible date (detected by
+    decomposing the result back into year/month/day and comparing).
+    """
+    arr = np.asarray(arr, dtype=np.uint16)
+    if arr.ndim != 2 or arr.shape[1] != 3:
+        raise ValueError(f"Expected (N, 3) timestamp words, got shape {arr.shape}")
+
+    years = 2000 + (arr[:, 0] >> 8).astype(np.int64)
+    months = (arr[:, 0] & 0xFF).astype(np.int64)
+    days = (arr[:, 1] >> 8).astype(np.int64)
+    hours = (arr[:, 1] & 0xFF).astype(np.int64)
+    minutes = (arr[:, 2] >> 8).astype(np.int64)
+    seconds = (arr[:, 2] & 0xFF).astype(np.int64)
+
+    ts = (years - 1970).astype("datetime64[Y]")
+    ts = ts.astype("datetime64[M]") + (months - 1).astype("timedelta64[M]")
+    ts = ts.astype("datetime64[D]") + (days - 1).astype("timedelta64[D]")
+    ts = ts.astype("datetime64[s]") + (
+        hours * 3600 + minutes * 60 + seconds
+    ).astype("timedelta64[s]")
+
+    # NumPy rolls invalid components over (month 13 -> next year) rather
+    # than raising like datetime(); decompose the result and compare to
+    # catch corrupt records.
+    ok = (
+        (ts.astype("datetime64[Y]").astype(np.int64) + 1970 == years)
+        & (ts.astype("datetime64[M]").astype(np.int64) % 12 + 1 == months)
+        & (
+            (ts.astype("datetime64[D]") - ts.astype("datetime64[M]")).astype(np.int64) + 1
+            == days
+        )
+        & (hours < 24) & (minutes < 60) & (seconds < 60)
+    )
+    if not ok.all():
+        i = int(np.flatnonzero(~ok)[0])
+        raise ValueError(
+            f"Invalid timestamp at record {i} from words: "
+            f"[0x{arr[i, 0]:04X}, 0x{arr[i, 1]:04X}, 0x{arr[i, 2]:04X}]"
+        )
+
+    return ts
+
+
 def format_dt(dt_obj):
     """
     Formatting helper used by main.py